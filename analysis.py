@@ -0,0 +1,133 @@
+import json
+import numpy as np
+from matplotlib.figure import Figure
+
+SHIP_HIT = -1  # Simulation.run returns -1 when the ship was hit
+PENDING = 999  # placeholder written by the sweep before a run has finished
+Z_95 = 1.959963984540054  # two sided 95% normal quantile
+
+
+def load_results(data_file):
+    """
+    Loads a raw results file (num_targets -> list of [with_laser, without_laser] pairs)
+    into flat NumPy arrays.
+
+    Returns:
+        tuple: (num_targets, with_laser, without_laser), one entry per replication.
+    """
+    with open(data_file, 'r') as json_file:
+        return results_to_arrays(json.load(json_file))
+
+
+def results_to_arrays(result):
+    """
+    Flattens a raw results dict into three aligned integer arrays.
+    """
+    keys = np.fromiter((int(k) for k in result), dtype=np.int64, count=len(result))
+    lengths = np.fromiter((len(v) for v in result.values()), dtype=np.int64, count=len(result))
+    num_targets = np.repeat(keys, lengths)
+    pairs = np.fromiter((value for pairs in result.values() for pair in pairs for value in pair),
+                        dtype=np.int64, count=2 * int(lengths.sum())).reshape(-1, 2)
+    return num_targets, pairs[:, 0], pairs[:, 1]
+
+
+def group_stats(groups, values):
+    """
+    Computes per group statistics of interceptor counts in a single pass over the data.
+    Ship hits (-1) are excluded from the interceptor statistics and counted for the hit
+    rate, pending placeholders (999) are ignored altogether.
+
+    Args:
+        groups (np.ndarray): group key of every replication (e.g. num_targets).
+        values (np.ndarray): interceptor count of every replication.
+
+    Returns:
+        dict: arrays keyed by 'keys', 'runs', 'mean', 'var', 'ci', 'hit_rate', 'hit_ci'.
+    """
+    keys, inverse = np.unique(groups, return_inverse=True)
+    n_groups = len(keys)
+    done = values != PENDING
+    hit = values == SHIP_HIT
+    valid = done & ~hit
+    x = np.where(valid, values, 0).astype(np.float64)
+
+    runs = np.bincount(inverse, weights=done, minlength=n_groups)
+    hits = np.bincount(inverse, weights=hit, minlength=n_groups)
+    count = np.bincount(inverse, weights=valid, minlength=n_groups)
+    total = np.bincount(inverse, weights=x, minlength=n_groups)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        deviation = np.where(valid, x - mean[inverse], 0)
+        var = np.bincount(inverse, weights=deviation ** 2, minlength=n_groups) / (count - 1)
+        ci = Z_95 * np.sqrt(var / count)
+        hit_rate = hits / runs
+        hit_ci = Z_95 * np.sqrt(hit_rate * (1 - hit_rate) / runs)
+
+    return {'keys': keys, 'runs': runs, 'mean': mean, 'var': var, 'ci': ci,
+            'hit_rate': hit_rate, 'hit_ci': hit_ci}
+
+
+def summarize(result):
+    """
+    Grouped statistics by num_targets for both the with and without laser runs.
+    Accepts either a raw results dict or the arrays returned by load_results.
+    """
+    if isinstance(result, dict):
+        result = results_to_arrays(result)
+    num_targets, with_laser, without_laser = result
+    return {'with': group_stats(num_targets, with_laser),
+            'without': group_stats(num_targets, without_laser)}
+
+
+def _json_value(value):
+    # NaN is not valid JSON, undefined averages are written as null
+    return None if np.isnan(value) else float(value)
+
+
+def averages(summary):
+    """
+    Converts a summary to the result_* file format. An average that is undefined because
+    its group has no finished runs (or, for interceptors, only ship hits) is None, which
+    json writes as null.
+    """
+    with_stats, without_stats = summary['with'], summary['without']
+    return {int(k): {'avg_interceptors_with': _json_value(with_stats['mean'][i]),
+                     'avg_interceptors_without': _json_value(without_stats['mean'][i]),
+                     'avg_hit_with': _json_value(with_stats['hit_rate'][i]),
+                     'avg_hit_without': _json_value(without_stats['hit_rate'][i])}
+            for i, k in enumerate(with_stats['keys'])}
+
+
+def plot_beam_effectiveness(summary, output_file, title='Beam Effectiveness vs Number of Initial Targets (Big Barrage)'):
+    """
+    Draws the average interceptions and hit rates with their 95% confidence bands and
+    saves the figure to output_file. Rendering is done off-screen, nothing is shown.
+    """
+    fig = Figure(figsize=(12, 7))
+    ax = fig.add_subplot()
+    for mode, marker, hit_marker in (('with', 'o', 'P'), ('without', 'x', 'v')):
+        stats = summary[mode]
+        keys = stats['keys']
+        ax.plot(keys, stats['mean'], marker=marker, label=f'avg_interceptors_{mode}')
+        ax.fill_between(keys, stats['mean'] - stats['ci'], stats['mean'] + stats['ci'], alpha=0.2)
+        ax.plot(keys, stats['hit_rate'], marker=hit_marker, label=f'avg_hit_{mode}')
+        ax.fill_between(keys, stats['hit_rate'] - stats['hit_ci'], stats['hit_rate'] + stats['hit_ci'], alpha=0.2)
+    ax.set_title(title)
+    ax.set_xlabel('Number of Initial Targets')
+    ax.set_ylabel('Average Interceptions')
+    ax.grid(True)
+    ax.invert_xaxis()  # Higher target counts on the left
+    ax.legend()
+    fig.savefig(output_file)
+    return fig
+
+
+if __name__ == "__main__":
+    data_file = "data_new"
+    result_file = "result_new"
+
+    summary = summarize(load_results(data_file))
+    with open(result_file, 'w') as file:
+        json.dump(averages(summary), file, indent=4)
+    plot_beam_effectiveness(summary, result_file + ".png")
@@ -1,14 +1,16 @@
 import math
 import numpy as np
 import target
+from scenario import DEFAULT_SCENARIO
 
-def generate_barrage(total_time):
+def generate_barrage(total_time, scenario=DEFAULT_SCENARIO):
     """
     Simulates barrages occurring according to Poisson processes and records
     the time and type of each barrage, using a uniform distribution for type selection.
 
     Args:
         total_time (float): The total simulation time in days.
+        scenario (Scenario): Supplies the barrage the engine plays out.
 
     Returns:
         list: A list of tuples, where each tuple contains the cumulative time
@@ -39,14 +41,15 @@ def generate_barrage(total_time):
 
         barrage_log.append((cumulative_time, barrage_type))
 
-    # ********************
-    barrage_log = [(0, 'big')]
-        
+    # The engine only plays out a single barrage at time 0. The schedule above is still drawn
+    # so that seeded runs use the random streams exactly as the original engine did.
+    barrage_log = [(0, scenario.fixed_barrage)]
+
     return barrage_log
 
 
 
-def generate_targets_by_barrage(barrage_type, x):
+def generate_targets_by_barrage(barrage_type, x, scenario=DEFAULT_SCENARIO):
     """
     Generates targets based on the type of barrage detected. For simplicity,
     this function currently generates a fixed number of targets.
@@ -55,11 +58,12 @@ def generate_targets_by_barrage(barrage_type, x):
         list: A list of target variables representing the generated targets.
     """
     if barrage_type == "small":
-        return [target.Drone() for _ in range(x)]
+        return [target.Drone(scenario=scenario) for _ in range(x)]
     elif barrage_type == "big":
-        drone_count = math.floor(0.6 * x)  # 60% drones
+        drone_count = math.floor(scenario.drone_fraction * x)
         anti_ship_missile_count = x - drone_count  
-        return [target.Drone() for _ in range(drone_count)] + [target.Anti_Ship_Missile() for _ in range(anti_ship_missile_count)]
+        return [target.Drone(scenario=scenario) for _ in range(drone_count)] + \
+            [target.Anti_Ship_Missile(scenario=scenario) for _ in range(anti_ship_missile_count)]
     
 def present_barrage_generation():
     simulation_duration = 14  # Simulate for 14 days
@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from functools import cached_property
+
+BARRAGE_TYPES = ("small", "big")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Physics and policy parameters of a single simulation setting.
+
+    Scenarios are immutable and hashable so they can be shipped to worker processes,
+    used as dict keys and compared between runs. Times are given in real seconds and
+    are scaled by time_const, the same way the former module constants were.
+    """
+    time_const: float = 10
+    rocket_speed: float = 750  # interceptor speed [m/s] before time scaling
+    dome_attempts: int = 3
+    rocket_launch_delay_seconds: float = 3  # delay between rocket launches at the same target
+    long_laser_cooldown_seconds: float = 3  # cooldown after a laser engagement
+    short_laser_cooldown_seconds: float = 2  # cooldown when the laser was cut off by a dome launch
+    explosion_duration_seconds: float = 0.5
+    mission_duration: float = 80
+    fixed_barrage: str = "big"  # the single barrage launched at time 0, "small" (drones only) or "big"
+    drone_fraction: float = 0.6  # share of drones in a big barrage, the rest are anti-ship missiles
+    time_step: float | None = None  # fixed simulation step [s], None runs in real time at 60 frames per second
+    analytic_intercepts: bool = False  # resolve dome interceptions at their computed time instead of per frame polling
+
+    def __post_init__(self):
+        # Simulation only plays out one barrage, at time 0, so Poisson barrage schedules and
+        # their rates cannot be studied until the engine spawns barrages over mission time.
+        if self.fixed_barrage not in BARRAGE_TYPES:
+            raise ValueError(f"fixed_barrage must be one of {BARRAGE_TYPES}, got {self.fixed_barrage!r}")
+
+    @cached_property
+    def rocket_speed_meters_per_second(self):
+        return self.rocket_speed * self.time_const
+
+    @cached_property
+    def rocket_launch_delay(self):
+        return self.rocket_launch_delay_seconds / self.time_const
+
+    @cached_property
+    def long_laser_cooldown(self):
+        return self.long_laser_cooldown_seconds / self.time_const
+
+    @cached_property
+    def short_laser_cooldown(self):
+        return self.short_laser_cooldown_seconds / self.time_const
+
+    @cached_property
+    def explosion_duration(self):
+        return self.explosion_duration_seconds / self.time_const
+
+
+DEFAULT_SCENARIO = Scenario()
@@ -3,11 +3,12 @@ import random
 import time
 import math
 from typing import Self
-from target import Target, Anti_Ship_Missile, Drone, Ballistic_Missile, TIME_CONST, ROCKET_SPEED_METERS_PER_SECOND
+from target import Target, Anti_Ship_Missile, Drone, Ballistic_Missile
+from scenario import Scenario, DEFAULT_SCENARIO
 import barrage  # Import barrage functions
 import json
 import numpy as np
-import matplotlib.pyplot as plt
+import analysis
 
 # --- Constants ---
 SCREEN_WIDTH = 800
@@ -26,16 +27,17 @@ PIXLES_PER_KM = 20
 LASER_WIDTH = 3
 ROCKET_WIDTH = 3  # Changed to 3 for the new rocket shape
 EXPLOSION_COLOR = (255, 255, 0)
-DOME_ATTEMPTS = 3
-EXPLOSION_DURATION = 0.5 / TIME_CONST
-ROCKET_LAUNCH_DELAY = 3 / TIME_CONST # Add a 5-second delay between rocket launches of the same target
+DOME_ATTEMPTS = DEFAULT_SCENARIO.dome_attempts
+EXPLOSION_DURATION = DEFAULT_SCENARIO.explosion_duration
+ROCKET_LAUNCH_DELAY = DEFAULT_SCENARIO.rocket_launch_delay # Add a delay between rocket launches of the same target
 ROCKET_LENGTH = 10  # new rocket length
 MAX_ROCKETS_PER_LAUNCH = 3  # Allow launching a pair of rockets
 GAME_OVER_REASON_TIME = 0
 GAME_OVER_REASON_SHIP_HIT = 1
 GAME_OVER_REASON_NO_TARGETS = 2
-LONG_LASER_COOLDOWN = 3 / TIME_CONST  # Add a cooldown for the laser
-SHORT_LASER_COOLDOWN = 2 / TIME_CONST  # Cooldown time for the laser when not firing
+LONG_LASER_COOLDOWN = DEFAULT_SCENARIO.long_laser_cooldown  # Add a cooldown for the laser
+SHORT_LASER_COOLDOWN = DEFAULT_SCENARIO.short_laser_cooldown  # Cooldown time for the laser when not firing
+UNIT_CELL_SIZE = 100  # grid cell size used to find the nearest defended unit
 
 
 class Simulation:
@@ -58,9 +60,102 @@ class Simulation:
         def get_position(self):
             return self.x, self.y
 
+    class DefendedUnit:
+        """A ship of the task group with its own laser and dome launcher."""
+        def __init__(self, x, y):
+            self.ship = Simulation.ShipSymbol(x, y)
+            self.target_symbols = []  # targets allocated to this unit for the current frame
+            self.quick_switch_flag = False
+            self.laser_interception_count = 0
+            self.intercepted_target_symbol = None
+            self.laser_beam_active = False
+            self.laser_start_point = (0, 0)
+            self.laser_end_point = (0, 0)
+            self.laser_end_time = 0
+            self.laser_cooldown_time = 0
+            self.interception_result = None
+            self.interceptors: list["Simulation.InterceptorSymbol"] = []  # List to store active rockets
+            self.last_rocket_launch_time = 0  # Store the time of the last rocket launch
+            self.target_symbols_launched_interceptors_at = []  # use this list to store rockets to be launched
+            self.interceptor_count = 0  # Initialize the rocket counter
+
+        def is_engaging(self, target_symbol):
+            return target_symbol in self.target_symbols_launched_interceptors_at or \
+                (self.laser_beam_active and target_symbol is self.intercepted_target_symbol)
+
+    class SpatialGrid:
+        """Uniform grid bucketing objects by position, for neighbourhood and nearest queries."""
+        def __init__(self, cell_size):
+            self.cell_size = cell_size
+            self.cells = {}
+            self.bounds = None  # (min_i, min_j, max_i, max_j) of the occupied cells
+
+        def cell(self, x, y):
+            return int(x // self.cell_size), int(y // self.cell_size)
+
+        def insert(self, item, x, y):
+            i, j = self.cell(x, y)
+            self.cells.setdefault((i, j), []).append(item)
+            if self.bounds is None:
+                self.bounds = (i, j, i, j)
+            else:
+                min_i, min_j, max_i, max_j = self.bounds
+                self.bounds = (min(min_i, i), min(min_j, j), max(max_i, i), max(max_j, j))
+
+        @staticmethod
+        def ring_cells(cx, cy, ring):
+            # the cells on the perimeter of the square of the given radius around (cx, cy)
+            if ring == 0:
+                yield cx, cy
+                return
+            for i in range(cx - ring, cx + ring + 1):
+                yield i, cy - ring
+                yield i, cy + ring
+            for j in range(cy - ring + 1, cy + ring):
+                yield cx - ring, j
+                yield cx + ring, j
+
+        def nearby(self, x, y):
+            # everything in the 3x3 block of cells around (x, y)
+            cx, cy = self.cell(x, y)
+            for i in range(cx - 1, cx + 2):
+                for j in range(cy - 1, cy + 2):
+                    yield from self.cells.get((i, j), ())
+
+        def nearest(self, x, y, position, accept=None):
+            # search rings of cells outwards until no closer item can exist, skipping items
+            # the accept predicate rejects
+            if self.bounds is None:
+                return None
+            cx, cy = self.cell(x, y)
+            min_i, min_j, max_i, max_j = self.bounds
+            max_ring = max(cx - min_i, max_i - cx, cy - min_j, max_j - cy, 0)
+            best, best_distance = None, math.inf
+            for ring in range(max_ring + 1):
+                if best_distance <= (ring - 1) * self.cell_size:
+                    break
+                # once a ring has more cells than the grid has occupied ones, the occupied cells
+                # not searched yet are checked directly instead of walking the empty rings
+                sparse = 8 * ring > len(self.cells)
+                if sparse:
+                    cells = [cell for cell in self.cells if max(abs(cell[0] - cx), abs(cell[1] - cy)) >= ring]
+                else:
+                    cells = self.ring_cells(cx, cy, ring)
+                for cell in cells:
+                    for item in self.cells.get(cell, ()):
+                        item_x, item_y = position(item)
+                        distance = math.hypot(item_x - x, item_y - y)
+                        if distance < best_distance and (accept is None or accept(item)):
+                            best, best_distance = item, distance
+                if sparse:
+                    break
+            return best
+
     class TargetSymbol:
-        def __init__(self, target: Target):
+        def __init__(self, target: Target, unit=None):
             self.target = target
+            self.unit = unit  # the defended unit this target is heading for
+            self.owner = None  # the defended unit allocated to engage this target
             self.z = 0
             self.set_xy(target.distance)
             self.size = TARGET_SIZE
@@ -71,8 +166,9 @@ class Simulation:
         def set_xy(self, distance):
             if not hasattr(self, 'angle'):
                 self.angle = random.uniform(0, 2 * math.pi)
-            self.x = CENTER_X + distance * math.cos(self.angle) * PIXLES_PER_KM
-            self.y = CENTER_Y + distance * math.sin(self.angle) * PIXLES_PER_KM
+            origin_x, origin_y = self.unit.ship.get_position() if self.unit else (CENTER_X, CENTER_Y)
+            self.x = origin_x + distance * math.cos(self.angle) * PIXLES_PER_KM
+            self.y = origin_y + distance * math.sin(self.angle) * PIXLES_PER_KM
 
         def update_distance(self, dt):
             try:
@@ -92,18 +188,79 @@ class Simulation:
         return target_symbol.get_target().distance
 
     def compare_target_dome_attempts(self, target_symbol: TargetSymbol):
-        return target_symbol.get_target().get_time_to_range_limit(ROCKET_SPEED_METERS_PER_SECOND)
+        return target_symbol.get_target().get_time_to_range_limit(self.scenario.rocket_speed_meters_per_second)
 
     class InterceptorSymbol:
         def __init__(self, start_x, start_y, target_symbol, velocity, double=False):
             self.x = start_x
             self.y = start_y
-            self.target_x = target_symbol.x
-            self.target_y = target_symbol.y
             self.target_symbol = target_symbol  # Store the target
             self.velocity = PIXLES_PER_KM * velocity / 1000
-            self.angle = math.atan2(target_symbol.y - start_y, target_symbol.x - start_x)  # calculate initial angle
+            # aim at the point where the target will be when the interceptor gets there
+            lead = self.lead(start_x, start_y, target_symbol, self.velocity)
+            if lead is not None:
+                self.flight_time, (self.target_x, self.target_y) = lead
+            else:
+                self.target_x, self.target_y = target_symbol.x, target_symbol.y
+                self.flight_time = math.hypot(self.target_x - start_x, self.target_y - start_y) / self.velocity
+            self.angle = math.atan2(self.target_y - start_y, self.target_x - start_x)  # calculate initial angle
+            self.elapsed_time = 0
             self.double = double
+            self.resolution_time = None  # time the interceptor reaches its target, if it ever does
+            self.intercept_point = None
+            self.intercept_distance = None  # target distance [km] at that time
+
+        def schedule_intercept(self, now):
+            # Both the interceptor and the target fly in straight lines at constant speed, so the
+            # first time they come within the target size of each other solves a quadratic.
+            target_symbol = self.target_symbol
+            target_speed = target_symbol.get_target().velocity / 3600 * PIXLES_PER_KM  # towards its unit [px/s]
+            rel_x = target_symbol.x - self.x
+            rel_y = target_symbol.y - self.y
+            vel_x = -target_speed * math.cos(target_symbol.angle) - self.velocity * math.cos(self.angle)
+            vel_y = -target_speed * math.sin(target_symbol.angle) - self.velocity * math.sin(self.angle)
+            a = vel_x ** 2 + vel_y ** 2
+            b = 2 * (rel_x * vel_x + rel_y * vel_y)
+            c = rel_x ** 2 + rel_y ** 2 - target_symbol.size ** 2
+            if c <= 0:
+                time_to_intercept = 0
+            else:
+                discriminant = b ** 2 - 4 * a * c
+                if a == 0 or discriminant < 0 or b >= 0:
+                    return  # the interceptor never gets close enough
+                time_to_intercept = (-b - math.sqrt(discriminant)) / (2 * a)
+            self.resolution_time = now + time_to_intercept
+            self.intercept_point = (self.x + self.velocity * math.cos(self.angle) * time_to_intercept,
+                                    self.y + self.velocity * math.sin(self.angle) * time_to_intercept)
+            self.intercept_distance = target_symbol.get_target().distance - \
+                target_symbol.get_target().velocity * time_to_intercept / 3600
+
+        @staticmethod
+        def lead(start_x, start_y, target_symbol, speed):
+            """
+            Time and aim point for an interceptor launched now from (start_x, start_y) at
+            speed [px/s] to meet the target, or None if it cannot catch it.
+            """
+            target_speed = target_symbol.get_target().velocity / 3600 * PIXLES_PER_KM  # towards its unit [px/s]
+            vel_x = -target_speed * math.cos(target_symbol.angle)
+            vel_y = -target_speed * math.sin(target_symbol.angle)
+            rel_x = target_symbol.x - start_x
+            rel_y = target_symbol.y - start_y
+            a = vel_x ** 2 + vel_y ** 2 - speed ** 2
+            b = 2 * (rel_x * vel_x + rel_y * vel_y)
+            c = rel_x ** 2 + rel_y ** 2
+            if a == 0:
+                times = [-c / b] if b != 0 else []
+            else:
+                discriminant = b ** 2 - 4 * a * c
+                if discriminant < 0:
+                    return None
+                times = [(-b - math.sqrt(discriminant)) / (2 * a), (-b + math.sqrt(discriminant)) / (2 * a)]
+            times = [t for t in times if t >= 0]
+            if not times:
+                return None
+            t = min(times)
+            return t, (target_symbol.x + vel_x * t, target_symbol.y + vel_y * t)
 
         def get_target_symbol(self):
             return self.target_symbol
@@ -111,7 +268,11 @@ class Simulation:
         def update_position(self, dt):
             self.x += self.velocity * math.cos(self.angle) * dt
             self.y += self.velocity * math.sin(self.angle) * dt
-            math.sin(self.angle) * dt
+            self.elapsed_time += dt
+
+        def has_missed(self):
+            # flew past the aim point without meeting the target
+            return self.elapsed_time > self.flight_time + 2 * self.target_symbol.size / self.velocity
 
         def draw(self, screen):
             # Draw a small triangle for the rocket
@@ -131,52 +292,58 @@ class Simulation:
             distance = math.sqrt((self.x - target_symbol.x) ** 2 + (self.y - target_symbol.y) ** 2)
             return distance <= target_symbol.size
 
-    def __init__(self):
+    def __init__(self, scenario: Scenario = DEFAULT_SCENARIO, unit_positions=None):
+        self.scenario = scenario
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Ship Interception Simulation")
         self.clock = pygame.time.Clock()
         self.game_over = False
-        self.quick_switch_flag = False
-        self.ship = self.ShipSymbol(CENTER_X, CENTER_Y)
+        if unit_positions is None:
+            unit_positions = [(CENTER_X, CENTER_Y)]
+        self.units = [self.DefendedUnit(x, y) for x, y in unit_positions]
+        self.unit_grid = self.SpatialGrid(UNIT_CELL_SIZE)
+        for unit in self.units:
+            self.unit_grid.insert(unit, *unit.ship.get_position())
         self.font = pygame.font.Font(None, 30)
         self.running = True
-        self.laser_interception_count = 0
         self.start_time = time.time()
-        self.intercepted_target_symbol = None
-        self.laser_beam_active = False
-        self.laser_start_point = (0, 0)
-        self.laser_end_point = (0, 0)
-        self.laser_end_time = 0
-        self.total_mission_duration = 80  # Total mission duration in days
-        self.simulated_barrages = barrage.generate_barrage(self.total_mission_duration)
+        self.clock_time = 0.0  # simulated clock, advanced by every step so runs replay exactly
+        self.total_mission_duration = scenario.mission_duration  # Total mission duration in days
+        self.simulated_barrages = barrage.generate_barrage(self.total_mission_duration, scenario)
         self.current_mission_time = 0
         self.explosion_time = 0
         self.target_symbols = []
         self.explosion_coords = None  # Store explosion coordinates
-        self.interceptors: list["Self.InterceptorSymbol"] = []  # List to store active rockets
-        self.last_rocket_launch_time = 0  # Store the time of the last rocket launch
-        self.target_symbols_launched_interceptors_at = []  # use this list to store rockets to be launched
-        self.interceptor_count = 0  # Initialize the rocket counter
-        self.laser_cooldown_time = 0
-        self.interception_result = None
+
+    @property
+    def ship(self):
+        return self.units[0].ship
+
+    @property
+    def interceptor_count(self):
+        return sum(unit.interceptor_count for unit in self.units)
+
+    @property
+    def laser_interception_count(self):
+        return sum(unit.laser_interception_count for unit in self.units)
 
     def draw_laser_line(self, start_x, start_y, end_x, end_y, width=LASER_WIDTH):
         pygame.draw.line(self.screen, LASER_COLOR, (start_x, start_y), (end_x, end_y), width)
 
 
-    def intercept_with_laser(self, target_to_intercept: TargetSymbol):
-        duration, self.interception_result = target_to_intercept.get_target().get_optimized_laser_firing_time()
-        self.laser_beam_active = True
-        ship_x, ship_y = self.ship.get_position()
-        self.laser_start_point = (int(ship_x), int(ship_y))
-        self.laser_end_point = (int(target_to_intercept.x), int(target_to_intercept.y))
-        self.laser_end_time = time.time() + duration
-        self.intercepted_target_symbol = target_to_intercept
+    def intercept_with_laser(self, unit: DefendedUnit, target_to_intercept: TargetSymbol):
+        duration, unit.interception_result = target_to_intercept.get_target().get_optimized_laser_firing_time()
+        unit.laser_beam_active = True
+        ship_x, ship_y = unit.ship.get_position()
+        unit.laser_start_point = (int(ship_x), int(ship_y))
+        unit.laser_end_point = (int(target_to_intercept.x), int(target_to_intercept.y))
+        unit.laser_end_time = self.clock_time + duration
+        unit.intercepted_target_symbol = target_to_intercept
 
 
     def draw_explosion(self, x, y):
-        radius = int((time.time() - self.explosion_time) * 30)
+        radius = int((self.clock_time - self.explosion_time) * 30)
         if radius < 30:
             pygame.draw.circle(self.screen, EXPLOSION_COLOR, (int(x), int(y)), radius)
 
@@ -186,10 +353,39 @@ class Simulation:
         if barrage_index < len(self.simulated_barrages):
             barrage_time, barrage_type = self.simulated_barrages[barrage_index]
             if self.current_mission_time >= barrage_time:
-                new_targets = barrage.generate_targets_by_barrage(barrage_type, num_targets)
-                self.target_symbols.extend([self.TargetSymbol(target) for target in new_targets])
+                new_targets = barrage.generate_targets_by_barrage(barrage_type, num_targets, self.scenario)
+                # the barrage is spread over the task group
+                self.target_symbols.extend([self.TargetSymbol(target, self.units[i % len(self.units)])
+                                            for i, target in enumerate(new_targets)])
                 barrage_index += 1
 
+    def remove_target(self, target_symbol: TargetSymbol):
+        self.target_symbols.remove(target_symbol)
+        if target_symbol.owner is not None:
+            target_symbol.owner.target_symbols.remove(target_symbol)
+        target_symbol.owner = None
+
+    def can_intercept(self, unit: DefendedUnit, target_symbol: TargetSymbol):
+        # an interceptor of this unit meets the target before it reaches its own unit
+        speed = PIXLES_PER_KM * self.scenario.rocket_speed_meters_per_second / 1000
+        lead = self.InterceptorSymbol.lead(*unit.ship.get_position(), target_symbol, speed)
+        return lead is not None and lead[0] < target_symbol.get_target().get_arrival_time()
+
+    def allocate_targets(self):
+        # Every target is engaged by exactly one unit: the nearest one, unless a unit is
+        # already engaging it, in which case the engagement is kept.
+        for unit in self.units:
+            unit.target_symbols = []
+        for target_symbol in self.target_symbols:
+            owner = target_symbol.owner
+            if owner is None or not owner.is_engaging(target_symbol):
+                owner = self.unit_grid.nearest(target_symbol.x, target_symbol.y, lambda unit: unit.ship.get_position(),
+                                               lambda unit: self.can_intercept(unit, target_symbol))
+                if owner is None:
+                    owner = target_symbol.unit  # the attacked unit always meets it head on
+            target_symbol.owner = owner
+            owner.target_symbols.append(target_symbol)
+
     def update_targets(self, dt):
         # Update target positions
         for target_symbol in self.target_symbols:
@@ -204,122 +400,189 @@ class Simulation:
         # Remove targets that go out of bounds
         self.target_symbols = [target_symbol for target_symbol in self.target_symbols]
 
-                    # Check for game over condition: Ship hit by target
-        for target_symbol in list(self.target_symbols):
-            if math.sqrt((self.ship.x - target_symbol.x) ** 2 + (self.ship.y - target_symbol.y) ** 2) < TARGET_SIZE:
+        # Check for game over condition: a ship hit by the target heading for it. The distance
+        # keeps decreasing past the ship, so large steps cannot tunnel through it.
+        for target_symbol in self.target_symbols:
+            if target_symbol.get_target().distance * PIXLES_PER_KM < TARGET_SIZE and \
+                    not self.has_due_intercept(target_symbol):
                 self.game_over = True
                 self.game_over_reason = GAME_OVER_REASON_SHIP_HIT
                 self.running = False
-                break
+                return
+
+        # or a ship hit by a target passing close to it on its way to another unit
+        target_grid = self.SpatialGrid(SHIP_SIZE)
+        for target_symbol in self.target_symbols:
+            target_grid.insert(target_symbol, target_symbol.x, target_symbol.y)
+        for unit in self.units:
+            for target_symbol in target_grid.nearby(unit.ship.x, unit.ship.y):
+                if target_symbol.unit is not unit and \
+                        math.sqrt((unit.ship.x - target_symbol.x) ** 2 + (unit.ship.y - target_symbol.y) ** 2) < TARGET_SIZE:
+                    self.game_over = True
+                    self.game_over_reason = GAME_OVER_REASON_SHIP_HIT
+                    self.running = False
+                    return
 
 
 
-    def intercept_with_laser_preferred_target(self):
-        if not (self.target_symbols and \
-            (self.laser_cooldown_time == 0 or (time.time() - self.laser_cooldown_time >= LONG_LASER_COOLDOWN and not self.quick_switch_flag) \
-                or (time.time() - self.laser_cooldown_time >= SHORT_LASER_COOLDOWN and self.quick_switch_flag)) and \
-            not self.laser_beam_active):
+    def intercept_with_laser_preferred_target(self, unit: DefendedUnit):
+        if not (unit.target_symbols and \
+            (unit.laser_cooldown_time == 0 or (self.clock_time - unit.laser_cooldown_time >= self.scenario.long_laser_cooldown and not unit.quick_switch_flag) \
+                or (self.clock_time - unit.laser_cooldown_time >= self.scenario.short_laser_cooldown and unit.quick_switch_flag)) and \
+            not unit.laser_beam_active):
             return
   #x
-        best_target_index = self.choose_target([target_symbol.get_target() for target_symbol in self.target_symbols])
-                                                                
+        best_target_index = self.choose_target(unit, [target_symbol.get_target() for target_symbol in unit.target_symbols])
+
         if best_target_index is not None:
-            target_to_intercept = self.target_symbols[best_target_index]
-            if target_to_intercept in self.target_symbols_launched_interceptors_at:
-                return self.intercept_with_laser_preferred_target()  # call intercept target
-            self.intercept_with_laser(target_to_intercept)  # call intercept target
+            target_to_intercept = unit.target_symbols[best_target_index]
+            if target_to_intercept in unit.target_symbols_launched_interceptors_at:
+                return self.intercept_with_laser_preferred_target(unit)  # call intercept target
+            self.intercept_with_laser(unit, target_to_intercept)  # call intercept target
         else:
             pass
 
 
 
-    def launch_dome(self, with_laser=True):            
+    def launch_dome(self, unit: DefendedUnit, with_laser=True):
         # Launch up to MAX_ROCKETS_PER_LAUNCH at a time, if available
-        if self.target_symbols:
-            ship_x, ship_y = self.ship.get_position()
+        if unit.target_symbols:
+            ship_x, ship_y = unit.ship.get_position()
+            rocket_speed = self.scenario.rocket_speed_meters_per_second
             # Sort targets by distance, closest first
             sorted_candidates_for_dome_interception: list["Simulation.TargetSymbol"] = []
-            for ts in self.target_symbols:
-                if with_laser and (ts.get_target().get_laser_attempts() < 1 or ts.get_target().get_dome_attempts(ROCKET_SPEED_METERS_PER_SECOND) < DOME_ATTEMPTS) and \
-                    ts.get_target().get_dome_attempts(ROCKET_SPEED_METERS_PER_SECOND) > 0:
+            for ts in unit.target_symbols:
+                if with_laser and (ts.get_target().get_laser_attempts() < 1 or ts.get_target().get_dome_attempts(rocket_speed) < self.scenario.dome_attempts) and \
+                    ts.get_target().get_dome_attempts(rocket_speed) > 0:
                     sorted_candidates_for_dome_interception.append(ts)
                 elif not with_laser:
                     sorted_candidates_for_dome_interception.append(ts)
             sorted_candidates_for_dome_interception = sorted(sorted_candidates_for_dome_interception, key=self.compare_target_dome_attempts)
-                        
+
             for target_symbol in sorted_candidates_for_dome_interception:
-                if target_symbol in self.target_symbols_launched_interceptors_at or \
-                        (time.time() - target_symbol.get_target().last_interception_time) < ROCKET_LAUNCH_DELAY:
+                if target_symbol in unit.target_symbols_launched_interceptors_at or \
+                        (self.clock_time - target_symbol.get_target().last_interception_time) < self.scenario.rocket_launch_delay:
                     continue
                 # shut down laser beam if dome is launched
-                if target_symbol is self.intercepted_target_symbol:
-                    self.laser_beam_active = False
-                    self.quick_switch_flag = True
-                    self.laser_cooldown_time = time.time()
+                if target_symbol is unit.intercepted_target_symbol:
+                    unit.laser_beam_active = False
+                    unit.quick_switch_flag = True
+                    unit.laser_cooldown_time = self.clock_time
                 # not to launch an interceptor at a target that already has an interceptor on the way
                 already_spawned_interceptor = False
-                for interceptor in self.interceptors:
+                for interceptor in unit.interceptors:
                     if interceptor.get_target_symbol() is target_symbol:
                         already_spawned_interceptor = True
                         break
                 if already_spawned_interceptor:
                     continue
-                
-                self.interceptor_count += 1  # Increment the rocket counter
-                new_interceptor = self.InterceptorSymbol(ship_x, ship_y, target_symbol, ROCKET_SPEED_METERS_PER_SECOND, double= \
-                                                                target_symbol.get_target().get_dome_attempts(ROCKET_SPEED_METERS_PER_SECOND) < 2)
-                if new_interceptor.double:
-                    self.interceptor_count += 1
-                self.interceptors.append(new_interceptor)
-                self.target_symbols_launched_interceptors_at.append(target_symbol)
 
+                unit.interceptor_count += 1  # Increment the rocket counter
+                new_interceptor = self.InterceptorSymbol(ship_x, ship_y, target_symbol, rocket_speed, double= \
+                                                                target_symbol.get_target().get_dome_attempts(rocket_speed) < 2)
+                if new_interceptor.double:
+                    unit.interceptor_count += 1
+                if self.scenario.analytic_intercepts:
+                    new_interceptor.schedule_intercept(self.clock_time)
+                unit.interceptors.append(new_interceptor)
+                unit.target_symbols_launched_interceptors_at.append(target_symbol)
+
+
+    def has_due_intercept(self, target_symbol: TargetSymbol):
+        # an analytic interception of this target is resolved later in the current step
+        owner = target_symbol.owner
+        return owner is not None and any(interceptor.get_target_symbol() is target_symbol and
+                                         interceptor.resolution_time is not None and
+                                         interceptor.resolution_time <= self.clock_time
+                                         for interceptor in owner.interceptors)
+
+    def resolve_interception(self, unit: DefendedUnit, interceptor: InterceptorSymbol, target_symbol: TargetSymbol,
+                             distance, resolution_time):
+        interception_probability = target_symbol.get_target()._interception_max_probabolities["dome"]
+        range_limit = {"drone": 0.5, "anti-ship": 4}[target_symbol.get_target().type]
+
+        if interceptor.double:
+            interception_probability = 1 - (1-interception_probability) ** 2
+
+        unit.interceptors.remove(interceptor)
+        unit.target_symbols_launched_interceptors_at.remove(target_symbol)  # Remove the target from the launched list
+
+        target_symbol.z = 2
+        if distance < range_limit:
+            self.remove_target(target_symbol)  # Remove the hit target
+            target_symbol.z = 3
+        elif random.random() > interception_probability:
+            target_symbol.get_target().last_interception_time = resolution_time
+            target_symbol.z = 4
+        else:
+            target_symbol.z = 5
+            self.explosion_time = resolution_time
+            self.explosion_coords = (interceptor.x, interceptor.y)  # Use rocket's position
+            self.remove_target(target_symbol)  # Remove the hit target
+
+    def update_interceptor_positions(self, unit: DefendedUnit, dt):
+        if self.scenario.analytic_intercepts:
+            self.resolve_scheduled_interceptions(unit, dt)
+            return
 
-    def update_interceptor_positions(self, dt):
         # Update rocket positions
-        for interceptor in self.interceptors:
+        for interceptor in unit.interceptors:
             interceptor.update_position(dt)
 
-        if self.target_symbols_launched_interceptors_at and not self.interceptors:
-            self.target_symbols_launched_interceptors_at = []
+        if unit.target_symbols_launched_interceptors_at and not unit.interceptors:
+            unit.target_symbols_launched_interceptors_at = []
+
+        # Check for rocket collisions. An interceptor only fuses on the target it was launched
+        # at: checking it against every launched target let it take another target that its own
+        # interceptor reached first, whenever both came within range in the same frame.
+        for interceptor in list(unit.interceptors):
+            target_symbol = interceptor.get_target_symbol()
+            # sanity check: the target was already destroyed
+            if target_symbol.owner is None:
+                self.release_interceptor(unit, interceptor)
+                continue
+
+            target_symbol.z = 1
+            if interceptor.check_collision(target_symbol):
+                self.resolve_interception(unit, interceptor, target_symbol,
+                                          target_symbol.get_target().distance, self.clock_time)
+
+        # an interceptor that flew past its target can no longer hit, release the target
+        for interceptor in list(unit.interceptors):
+            if interceptor.has_missed():
+                self.release_interceptor(unit, interceptor)
+
+    def release_interceptor(self, unit: DefendedUnit, interceptor: InterceptorSymbol):
+        unit.interceptors.remove(interceptor)
+        if interceptor.get_target_symbol() in unit.target_symbols_launched_interceptors_at:
+            unit.target_symbols_launched_interceptors_at.remove(interceptor.get_target_symbol())
+
+    def resolve_scheduled_interceptions(self, unit: DefendedUnit, dt):
+        # Interceptions are resolved at the time computed at launch, independent of the step size
+        if unit.target_symbols_launched_interceptors_at and not unit.interceptors:
+            unit.target_symbols_launched_interceptors_at = []
+
+        for interceptor in sorted(unit.interceptors, key=lambda i: i.resolution_time or math.inf):
+            target_symbol = interceptor.get_target_symbol()
+            # the target was already destroyed, or the interceptor never gets close enough
+            if target_symbol.owner is None or interceptor.resolution_time is None:
+                self.release_interceptor(unit, interceptor)
+                continue
+
+            target_symbol.z = 1
+            if interceptor.resolution_time > self.clock_time:
+                interceptor.update_position(dt)
+                continue
+            interceptor.x, interceptor.y = interceptor.intercept_point
+            self.resolve_interception(unit, interceptor, target_symbol,
+                                      interceptor.intercept_distance, interceptor.resolution_time)
 
-        # Check for rocket collisions
-        for interceptor in self.interceptors:  # Iterate over a copy to allow removal
-            # sanity check:
-            if interceptor.get_target_symbol() not in self.target_symbols:
-                if interceptor.get_target_symbol() in self.target_symbols_launched_interceptors_at:
-                    self.target_symbols_launched_interceptors_at.remove(interceptor.get_target_symbol())
-                self.interceptors.remove(interceptor)
-            
-            for target_symbol in self.target_symbols_launched_interceptors_at:
-                target_symbol.z = 1
-                if interceptor.check_collision(target_symbol) and interceptor in self.interceptors:
-                    interception_probability = target_symbol.get_target()._interception_max_probabolities["dome"]
-                    range_limit = {"drone": 0.5, "anti-ship": 4}[target_symbol.get_target().type]
-                    
-                    if interceptor.double:
-                        interception_probability = 1 - (1-interception_probability) ** 2
-
-                    self.interceptors.remove(interceptor)
-                    self.target_symbols_launched_interceptors_at.remove(target_symbol)  # Remove the target from the launched list
-                    
-                    target_symbol.z = 2
-                    if target_symbol.get_target().distance < range_limit:
-                        self.target_symbols.remove(target_symbol)  # Remove the hit target
-                        target_symbol.z = 3
-                    elif random.random() > interception_probability:
-                        target_symbol.get_target().last_interception_time = time.time()
-                        target_symbol.z = 4
-                    else:
-                        target_symbol.z = 5
-                        self.explosion_time = time.time()
-                        self.explosion_coords = (interceptor.x, interceptor.y)  # Use rocket's position
-                        self.target_symbols.remove(target_symbol)  # Remove the hit target
-                
     def drawing_screen(self, dt):
         # Draw everything
         self.screen.fill(BACKGROUND_COLOR)
 
-        self.ship.draw(self.screen)
+        for unit in self.units:
+            unit.ship.draw(self.screen)
 
         for target_symbol in self.target_symbols:
             # Get target color based on type
@@ -334,12 +597,13 @@ class Simulation:
             target_symbol.draw(self.screen, target_color)
 
         # Draw rockets
-        for interceptor in self.interceptors:
-            interceptor.draw(self.screen)
+        for unit in self.units:
+            for interceptor in unit.interceptors:
+                interceptor.draw(self.screen)
 
         # Draw explosion
         if self.explosion_time > 0 and self.explosion_coords:
-            if time.time() - self.explosion_time < EXPLOSION_DURATION:
+            if self.clock_time - self.explosion_time < self.scenario.explosion_duration:
                 self.draw_explosion(self.explosion_coords[0], self.explosion_coords[1])
             else:
                 self.explosion_time = 0
@@ -347,11 +611,12 @@ class Simulation:
         elif self.explosion_time > 0 and not self.explosion_coords:
             self.explosion_time = 0
 
-        # Draw laser beam
-        if self.laser_beam_active and time.time() < self.laser_end_time and self.intercepted_target_symbol:
-            ship_x, ship_y = self.ship.get_position()
-            target_x, target_y = self.intercepted_target_symbol.x, self.intercepted_target_symbol.y
-            self.draw_laser_line(int(ship_x), int(ship_y), int(target_x), int(target_y))
+        # Draw laser beams
+        for unit in self.units:
+            if unit.laser_beam_active and self.clock_time < unit.laser_end_time and unit.intercepted_target_symbol:
+                ship_x, ship_y = unit.ship.get_position()
+                target_x, target_y = unit.intercepted_target_symbol.x, unit.intercepted_target_symbol.y
+                self.draw_laser_line(int(ship_x), int(ship_y), int(target_x), int(target_y))
 
         # Display timer
         timer_text = self.font.render(f"Time: {self.current_mission_time:.2f} s", True, FONT_COLOR)
@@ -383,21 +648,21 @@ class Simulation:
             pygame.display.flip()
             # time.sleep(2)  # Keep the message displayed for 5 seconds
 
-    def handle_laser_interception(self):
-        if time.time() > self.laser_end_time and self.laser_beam_active:
-            if self.interception_result:
-                self.laser_interception_count += 1
-                self.explosion_time = time.time()
-                self.explosion_coords = (self.intercepted_target_symbol.x, self.intercepted_target_symbol.y)
-                self.target_symbols.remove(self.intercepted_target_symbol)
-            self.quick_switch_flag = False
-            self.laser_cooldown_time = time.time()
-            self.laser_beam_active = False
-
-    def choose_target(self, on_air_targets: list[Target]):
+    def handle_laser_interception(self, unit: DefendedUnit):
+        if self.clock_time > unit.laser_end_time and unit.laser_beam_active:
+            if unit.interception_result:
+                unit.laser_interception_count += 1
+                self.explosion_time = self.clock_time
+                self.explosion_coords = (unit.intercepted_target_symbol.x, unit.intercepted_target_symbol.y)
+                self.remove_target(unit.intercepted_target_symbol)
+            unit.quick_switch_flag = False
+            unit.laser_cooldown_time = self.clock_time
+            unit.laser_beam_active = False
+
+    def choose_target(self, unit: DefendedUnit, on_air_targets: list[Target]):
         if not on_air_targets:
             return None
-                    
+
         best_ratio = -1
         best_target_index = None
 
@@ -413,7 +678,7 @@ class Simulation:
             # Assuming distance and velocity are updated elsewhere based on current_time
             max_ratio_of_interception_by_time = target.get_optimized_laser_firing_time(choice_oriented=True)
             if max_ratio_of_interception_by_time > best_ratio and target.amount_of_attempts_to_intercept_with_laser < 2 \
-                and target.distance > 1 and target not in self.target_symbols_launched_interceptors_at:
+                and target.distance > 1 and target not in unit.target_symbols_launched_interceptors_at:
                 best_ratio = max_ratio_of_interception_by_time
                 best_target_index = i
 
@@ -426,8 +691,12 @@ class Simulation:
         self.generate_targets(num_targets)
 
         while self.running:
-            dt = self.clock.tick(60) / 1000.0 
+            if self.scenario.time_step is None:
+                dt = self.clock.tick(60) / 1000.0
+            else:
+                dt = self.scenario.time_step
             self.current_mission_time += dt
+            self.clock_time += dt
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -442,19 +711,33 @@ class Simulation:
                 continue
 
             self.update_targets(dt)
-            if with_laser:
-                self.intercept_with_laser_preferred_target()
-                self.handle_laser_interception()
-            self.launch_dome(with_laser)
-            self.update_interceptor_positions(dt)
+            self.allocate_targets()
+            for unit in self.units:
+                if with_laser:
+                    self.intercept_with_laser_preferred_target(unit)
+                    self.handle_laser_interception(unit)
+                self.launch_dome(unit, with_laser)
+                self.update_interceptor_positions(unit, dt)
             self.drawing_screen(dt)
             self.check_game_over()
 
-            
+
+        interceptor_count = self.interceptor_count
         if self.game_over_reason == GAME_OVER_REASON_SHIP_HIT:
-            self.interceptor_count = -1
+            interceptor_count = -1
         pygame.quit()
-        return self.interceptor_count
+        return interceptor_count
+
+
+def run_scenario(scenario: Scenario, num_targets, with_laser=True, seed=None, unit_positions=None):
+    """
+    Runs a single simulation of the given scenario. Defined at module level so it can be
+    mapped over a multiprocessing pool, each worker seeding its own random streams.
+    """
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    return Simulation(scenario, unit_positions).run(num_targets, with_laser=with_laser)
 
 if __name__ == "__main__":
     NEW_FILE = True
@@ -502,45 +785,12 @@ if __name__ == "__main__":
                 json.dump(result, json_file, indent=4)
 
     # Step 2: Calculate averages
-    averages = {}
-
-    for num_targets, successes in result.items():
-        filtered_with = [item[0] for item in successes if item[0] != -1]
-        sum_interceptors_with = sum(filtered_with)
-        avg_interceptors_with = sum_interceptors_with / len(filtered_with)
-        avg_hit_with = len([item[0] for item in successes if item[0] == -1]) / len(successes)
-
-        filtered_without = [item[1] for item in successes if item[1] != -1]
-        sum_interceptors_without = sum(filtered_without)
-        avg_interceptors_without = sum_interceptors_without / len(filtered_without)
-        avg_hit_without = len([item[1] for item in successes if item[1] == -1]) / len(successes)
-        
-        averages[int(num_targets)] = {'avg_interceptors_with': avg_interceptors_with, 'avg_interceptors_without': avg_interceptors_without,
-                                      'avg_hit_with': avg_hit_with, 'avg_hit_without': avg_hit_without}
+    summary = analysis.summarize(result)
+    averages = analysis.averages(summary)
 
     # Save averages
     with open(result_file, 'w') as file:
         json.dump(averages, file, indent=4)
 
     # Step 3: Plot the graph
-    sorted_targets = sorted(averages.keys(), key=lambda x: int(x))
-    avg_interceptors_with = [averages[k]['avg_interceptors_with'] for k in sorted_targets]
-    avg_interceptors_without = [averages[k]['avg_interceptors_without'] for k in sorted_targets]
-    avg_hit_with = [averages[k]['avg_hit_with'] for k in sorted_targets]
-    avg_hit_without = [averages[k]['avg_hit_without'] for k in sorted_targets]  
-    
-    plt.figure(figsize=(12, 7))
-    plt.plot(sorted_targets, avg_interceptors_with, marker='o', label='avg_interceptors_with')
-    plt.plot(sorted_targets, avg_interceptors_without, marker='x', label='avg_interceptors_without')
-    plt.plot(sorted_targets, avg_hit_with, marker='P', label='avg_hit_with')
-    plt.plot(sorted_targets, avg_hit_without, marker='v', label='avg_hit_without')
-    plt.title('Beam Effectiveness vs Number of Initial Targets (Big Barrage)')
-    plt.xlabel('Number of Initial Targets')
-    plt.ylabel('Average Interceptions')
-    plt.grid(True)
-    plt.gca().invert_xaxis()  # Optional: Higher target counts on the left
-    plt.legend()
-    plt.show()
-    
-
-    
+    analysis.plot_beam_effectiveness(summary, result_file + ".png")
@@ -0,0 +1,193 @@
+import itertools
+import numpy as np
+from scenario import Scenario
+from sweep import point_to_scenario, load_table, SHIP_HIT, SWEEP_SCENARIO
+from simulation import run_scenario
+
+
+class PolynomialRegression:
+    """
+    Bayesian polynomial regression: ridge regression on all monomials of the
+    standardized inputs up to the given degree, with the closed form covariance of
+    the coefficients giving the uncertainty of every prediction.
+    """
+    def __init__(self, degree=2, alpha=1e-3, min_noise_var=0.0):
+        self.degree = degree
+        self.alpha = alpha
+        self.min_noise_var = min_noise_var  # keeps the uncertainty alive when the fit is exact
+
+    def _design(self, x):
+        z = (x - self.x_mean) / self.x_scale
+        z = np.concatenate([z, np.ones((len(z), 1))], axis=1)  # the padding column of ones
+        return np.prod(z[:, self.term_index], axis=2)
+
+    def fit(self, x, y):
+        x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+        y = np.asarray(y, dtype=np.float64)
+        self.x_mean = x.mean(axis=0)
+        self.x_scale = np.where(x.std(axis=0) > 0, x.std(axis=0), 1)
+        n_inputs = x.shape[1]
+        self.terms = [term for d in range(self.degree + 1)
+                      for term in itertools.combinations_with_replacement(range(n_inputs), d)]
+        # every monomial as a fixed length row of input indices, padded with the ones column
+        self.term_index = np.array([term + (n_inputs,) * (self.degree - len(term)) for term in self.terms],
+                                   dtype=np.intp).reshape(len(self.terms), self.degree)
+
+        phi = self._design(x)
+        precision = phi.T @ phi + self.alpha * np.eye(len(self.terms))
+        self.cov = np.linalg.pinv(precision)
+        self.coef = self.cov @ phi.T @ y
+        residual = y - phi @ self.coef
+        dof = max(len(y) - len(self.terms), 1)
+        self.noise_var = max(residual @ residual / dof, self.min_noise_var)
+        return self
+
+    def predict(self, x):
+        """
+        Returns:
+            tuple: (mean, std) arrays, std being the standard error of the mean prediction.
+        """
+        phi = self._design(np.atleast_2d(np.asarray(x, dtype=np.float64)))
+        mean = phi @ self.coef
+        var = self.noise_var * ((phi @ self.cov) * phi).sum(axis=1)
+        return mean, np.sqrt(np.maximum(var, 0))
+
+
+class Surrogate:
+    """
+    Answers what-if queries (expected interceptor count and ship-hit probability for a
+    design point) from accumulated sweep results, running fresh simulations only when
+    the surrogate is not confident enough.
+    """
+    def __init__(self, features, degree=2, max_interceptors_std=1.0, max_hit_std=0.05,
+                 base: Scenario = SWEEP_SCENARIO):
+        self.features = list(features)
+        self.degree = degree
+        self.max_interceptors_std = max_interceptors_std
+        self.max_hit_std = max_hit_std
+        self.base = base
+        self.categories = {}
+        self.columns = None
+        self.next_seed = 0  # fallback runs start here, past every seed already in the table
+
+    def is_known(self, point):
+        # categories never seen in training cannot be predicted
+        return all(point[name] in categories for name, categories in self.categories.items())
+
+    def _encode_point(self, point, with_laser):
+        if not self.is_known(point):
+            unknown = {name: point[name] for name, categories in self.categories.items()
+                       if point[name] not in categories}
+            raise ValueError(f"categories not seen in training: {unknown}")
+        encoded = []
+        for name in self.features:
+            if name in self.categories:
+                encoded.extend(float(point[name] == c) for c in self.categories[name][1:])
+            else:
+                encoded.append(float(point[name]))
+        encoded.append(float(with_laser))
+        return np.array([encoded])
+
+    def _encode(self, rows, with_laser):
+        # categorical features are one-hot encoded, the first category being the reference
+        encoded = []
+        for name in self.features:
+            values = rows[name]
+            if name in self.categories:
+                encoded.extend(np.asarray(values == c, dtype=np.float64) for c in self.categories[name][1:])
+            else:
+                encoded.append(np.asarray(values, dtype=np.float64))
+        encoded.append(np.asarray(with_laser, dtype=np.float64))
+        return np.column_stack(encoded)
+
+    def fit(self, columns):
+        """
+        Fits both models to a table of runs with the seed of every run, as returned by
+        sweep.load_table.
+        """
+        self.columns = columns
+        if len(columns['seed']):
+            self.next_seed = max(self.next_seed, int(columns['seed'].max()) + 1)
+        self.categories = {name: sorted(set(columns[name])) for name in self.features
+                           if columns[name].dtype == object}
+        x = self._encode(columns, columns['with_laser'])
+        hit = columns['interceptors'] == SHIP_HIT
+        self.interceptors_model = PolynomialRegression(self.degree).fit(x[~hit], columns['interceptors'][~hit])
+        # Without any ship hit in the data the residuals vanish; the Bernoulli variance of the
+        # Laplace estimate of the hit rate keeps the uncertainty growing away from the data.
+        hit_rate = (hit.sum() + 1) / (len(hit) + 2)
+        self.hit_model = PolynomialRegression(self.degree, min_noise_var=hit_rate * (1 - hit_rate)) \
+            .fit(x, hit.astype(np.float64))
+        return self
+
+    @classmethod
+    def from_table(cls, table_file, features, **kwargs):
+        return cls(features, **kwargs).fit(load_table(table_file))
+
+    def predict(self, point, with_laser=True):
+        """
+        Returns:
+            dict: 'interceptors' and 'hit_probability', each a (mean, std) pair.
+        """
+        x = self._encode_point(point, with_laser)
+        interceptors, interceptors_std = self.interceptors_model.predict(x)
+        hit, hit_std = self.hit_model.predict(x)
+        return {'interceptors': (float(interceptors[0]), float(interceptors_std[0])),
+                'hit_probability': (float(np.clip(hit[0], 0, 1)), float(hit_std[0]))}
+
+    def query(self, point, with_laser=True, repetitions=20, seed=None):
+        """
+        Predicts from the surrogate, falling back to running the simulation when either
+        uncertainty exceeds its threshold or a category was never seen in training.
+        Fallback runs are added to the training data. Unless a seed is given they use
+        seeds not yet in the table, so that repeated queries gather new information.
+        """
+        if self.is_known(point):
+            prediction = self.predict(point, with_laser)
+            if prediction['interceptors'][1] <= self.max_interceptors_std and \
+                    prediction['hit_probability'][1] <= self.max_hit_std:
+                prediction['source'] = 'surrogate'
+                return prediction
+
+        if seed is None:
+            seed = self.next_seed
+        seeds = np.arange(seed, seed + repetitions)
+        num_targets, scenario = point_to_scenario(point, self.base)
+        runs = np.array([run_scenario(scenario, num_targets, with_laser, seed=int(s)) for s in seeds],
+                        dtype=np.float64)
+        self.add_runs(point, with_laser, runs, seeds)
+
+        hits = runs == SHIP_HIT
+        survived = runs[~hits]
+        hit_rate = hits.mean()
+        interceptors_std = survived.std(ddof=1) / np.sqrt(len(survived)) if len(survived) > 1 else float('nan')
+        return {'interceptors': (float(survived.mean()) if len(survived) else float('nan'), float(interceptors_std)),
+                'hit_probability': (float(hit_rate), float(np.sqrt(hit_rate * (1 - hit_rate) / len(runs)))),
+                'source': 'simulation'}
+
+    def add_runs(self, point, with_laser, runs, seeds):
+        """
+        Appends simulation results for a point and refits the surrogate. Runs whose seed is
+        already in the table for the same point repeat a known run and are skipped, as they
+        would shrink the uncertainty without adding information.
+        """
+        seeds = np.asarray(seeds, dtype=np.float64)
+        at_point = self.columns['with_laser'] == float(with_laser)
+        for name in self.features:
+            at_point &= self.columns[name] == point[name]
+        fresh = ~np.isin(seeds, self.columns['seed'][at_point])
+        if not fresh.any():
+            return self
+        count = int(fresh.sum())
+        new = {name: np.array([point[name]] * count, dtype=self.columns[name].dtype) for name in self.features}
+        new['seed'] = seeds[fresh]
+        new['with_laser'] = np.full(count, float(with_laser))
+        new['interceptors'] = np.asarray(runs, dtype=np.float64)[fresh]
+        return self.fit({name: np.concatenate([self.columns[name], new[name]]) for name in new})
+
+
+if __name__ == "__main__":
+    surrogate = Surrogate.from_table("sweep_results.csv", ['num_targets', 'drone_fraction',
+                                                           'rocket_speed', 'long_laser_cooldown_seconds'])
+    print(surrogate.query({'num_targets': 73, 'drone_fraction': 0.7,
+                           'rocket_speed': 750, 'long_laser_cooldown_seconds': 3}))
@@ -0,0 +1,162 @@
+import csv
+import os
+import dataclasses
+import functools
+import multiprocessing
+import numpy as np
+from scenario import Scenario
+from simulation import run_scenario
+
+SHIP_HIT = -1
+LASER_COST_FACTOR = 3  # runs with the laser take roughly three times as long to play out
+# Sweeps run on a fixed step with analytic interceptions instead of playing out in real time
+SWEEP_SCENARIO = Scenario(time_step=0.05, analytic_intercepts=True)
+
+# Example study: the whole space the laser benefit is mapped over. The barrage mix is a single
+# axis, a small barrage being a big one made of drones only (drone_fraction 1.0).
+DEFAULT_SPACE = {
+    'num_targets': (10, 100),
+    'drone_fraction': (0.0, 1.0),
+    'rocket_speed': (500.0, 1000.0),
+    'long_laser_cooldown_seconds': (1.0, 5.0),
+}
+
+
+def _axis_values(bounds, fractions):
+    """
+    Maps fractions in [0, 1) onto an axis. Numeric axes are (low, high) tuples, integer
+    bounds give integer values (so only use them for genuinely discrete parameters, as
+    rounding merges Latin hypercube strata); categorical axes are lists of choices.
+    """
+    if isinstance(bounds, list):
+        return [bounds[min(int(f * len(bounds)), len(bounds) - 1)] for f in fractions]
+    low, high = bounds
+    values = low + np.asarray(fractions) * (high - low)
+    if isinstance(low, int) and isinstance(high, int):
+        return [int(v) for v in np.rint(values)]
+    return [float(v) for v in values]
+
+
+def grid_design(space, points_per_axis):
+    """
+    Full factorial design. Numeric axes get points_per_axis evenly spaced values
+    (endpoints included), categorical axes use every choice.
+
+    Returns:
+        list: A list of dicts mapping axis name to value.
+    """
+    axes = []
+    for name, bounds in space.items():
+        if isinstance(bounds, list):
+            values = list(bounds)
+        else:
+            fractions = np.linspace(0, 1, points_per_axis)
+            values = list(dict.fromkeys(_axis_values(bounds, fractions)))  # integer axes may collapse
+        axes.append((name, values))
+
+    design = [{}]
+    for name, values in axes:
+        design = [dict(point, **{name: value}) for point in design for value in values]
+    return design
+
+
+def latin_hypercube_design(space, n, seed=None):
+    """
+    Latin hypercube design: every axis is split into n equal strata and each stratum
+    is sampled exactly once.
+
+    Returns:
+        list: A list of n dicts mapping axis name to value.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, bounds in space.items():
+        fractions = (rng.permutation(n) + rng.random(n)) / n
+        columns[name] = _axis_values(bounds, fractions)
+    return [{name: values[i] for name, values in columns.items()} for i in range(n)]
+
+
+def point_to_scenario(point, base: Scenario = SWEEP_SCENARIO):
+    """
+    Splits a design point into the number of targets and the scenario to run.
+    """
+    fields = {name: value for name, value in point.items() if name != 'num_targets'}
+    return point['num_targets'], dataclasses.replace(base, **fields)
+
+
+def expected_cost(point, with_laser):
+    # run time grows with the number of targets that have to be engaged
+    return point['num_targets'] * (LASER_COST_FACTOR if with_laser else 1)
+
+
+def plan_tasks(design, repetitions, seed=0):
+    """
+    Expands a design into one task per (point, laser mode, repetition), ordered by
+    decreasing expected cost so the longest runs are dispatched first.
+    """
+    tasks = []
+    for point_id, point in enumerate(design):
+        for with_laser in (True, False):
+            for repetition in range(repetitions):
+                tasks.append({'point_id': point_id, 'point': point, 'with_laser': with_laser,
+                              'repetition': repetition})
+    for task_seed, task in enumerate(tasks, start=seed):
+        task['seed'] = task_seed
+    tasks.sort(key=lambda task: expected_cost(task['point'], task['with_laser']), reverse=True)
+    return tasks
+
+
+def _init_worker():
+    # workers never show a window
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def _run_task(task, base: Scenario = SWEEP_SCENARIO):
+    num_targets, scenario = point_to_scenario(task['point'], base)
+    interceptors = run_scenario(scenario, num_targets, with_laser=task['with_laser'], seed=task['seed'])
+    row = {'point_id': task['point_id'], 'repetition': task['repetition'], 'seed': task['seed'],
+           'with_laser': int(task['with_laser'])}
+    row.update(task['point'])
+    row['interceptors'] = interceptors
+    row['ship_hit'] = int(interceptors == SHIP_HIT)
+    return row
+
+
+def run_sweep(design, output_file, repetitions=10, workers=None, seed=0, base: Scenario = SWEEP_SCENARIO):
+    """
+    Runs every design point with and without the laser over a worker pool and writes
+    one row per run to a single CSV table. Tasks are handed out one at a time, longest
+    first, so that workers stay evenly loaded; rows are flushed as they complete.
+    """
+    tasks = plan_tasks(design, repetitions, seed)
+    fieldnames = ['point_id', 'repetition', 'seed', 'with_laser'] + list(design[0]) + ['interceptors', 'ship_hit']
+    with open(output_file, 'w', newline='') as table, \
+            multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        writer = csv.DictWriter(table, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in pool.imap_unordered(functools.partial(_run_task, base=base), tasks, chunksize=1):
+            writer.writerow(row)
+            table.flush()
+
+
+def load_table(table_file):
+    """
+    Loads a sweep table into a dict of NumPy columns. Numeric columns become float
+    arrays, categorical columns stay as object arrays.
+    """
+    with open(table_file, newline='') as table:
+        rows = list(csv.DictReader(table))
+    columns = {}
+    for name in rows[0] if rows else []:
+        values = [row[name] for row in rows]
+        try:
+            columns[name] = np.array(values, dtype=np.float64)
+        except ValueError:
+            columns[name] = np.array(values, dtype=object)
+    return columns
+
+
+if __name__ == "__main__":
+    design = latin_hypercube_design(DEFAULT_SPACE, 200, seed=0)
+    run_sweep(design, "sweep_results.csv", repetitions=5)
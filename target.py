@@ -2,18 +2,20 @@ import math
 import numpy as np
 import random
 import matplotlib.pyplot as plt
-TIME_CONST = 10
-ROCKET_SPEED_METERS_PER_SECOND = 750 * TIME_CONST # Speed of the rocket in meters per second
+from scenario import DEFAULT_SCENARIO
+TIME_CONST = DEFAULT_SCENARIO.time_const
+ROCKET_SPEED_METERS_PER_SECOND = DEFAULT_SCENARIO.rocket_speed_meters_per_second # Speed of the rocket in meters per second
 class Target:
-    def __init__(self, distance, velocity, target_type, interception_max_probabilities, laser_interception_timing_data=None):
+    def __init__(self, distance, velocity, target_type, interception_max_probabilities, laser_interception_timing_data=None, scenario=DEFAULT_SCENARIO):
+        self.scenario = scenario
         self.distance = distance
-        self.velocity = velocity * TIME_CONST
+        self.velocity = velocity * scenario.time_const
         self.type = target_type
         self._interception_max_probabolities = interception_max_probabilities
         self._laser_interception_timing_data = laser_interception_timing_data
         self.amount_of_attempts_to_intercept_with_laser = 0
         self.amount_of_attempts_to_intercept_with_dome = 0
-        self.last_interception_time = 0
+        self.last_interception_time = -math.inf  # never attempted
         self.delay_between_interceptions = 0
 
         
@@ -69,15 +71,16 @@ class Target:
     def get_dome_interception_time(self): 
         interception_timing_data = {5 : 7, 10 : 12}
         linear_interploated_time = self.linear_interpolate(self.distance, interception_timing_data)
-        return linear_interploated_time / TIME_CONST
+        return linear_interploated_time / self.scenario.time_const
     
     def get_balistic_interception(self):
         interception_timing_data = {10 : 15, 20 : 25} # to be checked with Shaked
         linear_interploated_time = self.linear_interpolate(self.distance, interception_timing_data)
-        return linear_interploated_time / TIME_CONST
+        return linear_interploated_time / self.scenario.time_const
     
     def get_max_fire_time(self):
-        return Target.linear_interpolate(self.distance, self._laser_interception_timing_data) / TIME_CONST if self.distance > 2 else 2 / TIME_CONST
+        return Target.linear_interpolate(self.distance, self._laser_interception_timing_data) / self.scenario.time_const if self.distance > 2 \
+            else 2 / self.scenario.time_const
 
     def get_optimized_laser_firing_time(self, choice_oriented=False):
         n = 3 # n standard deviations
@@ -147,11 +150,11 @@ class Target:
             if self.distance < 4:
                 return 0
             arrival_time_of_target_to_range_limit = (self.distance - 4) / self.velocity * 3600
-        arrival_time_of_interceptor_to_range_limit = (self.distance - 0.5) / ROCKET_SPEED_METERS_PER_SECOND / 1000 
+        arrival_time_of_interceptor_to_range_limit = (self.distance - 0.5) / self.scenario.rocket_speed_meters_per_second / 1000 
         return arrival_time_of_target_to_range_limit/arrival_time_of_interceptor_to_range_limit
         
 class Anti_Ship_Missile(Target):
-    def __init__(self, distance=None, velocity=None):
+    def __init__(self, distance=None, velocity=None, scenario=DEFAULT_SCENARIO):
         interception_max_probabolities = {"dome": 0.85, "beam" : 0.8, "LRAD": 0.8}
         laser_interception_timing_data = {12 : 12, 14 : 14} # distance [km] : time [s], the first one
                                                             # should be checked with Shaked
@@ -162,25 +165,25 @@ class Anti_Ship_Missile(Target):
                 velocity = np.random.normal(819, 50)  
             else:
                 velocity = np.random.normal(514, 30) 
-        super().__init__(distance, velocity, "anti-ship", interception_max_probabolities, laser_interception_timing_data)
+        super().__init__(distance, velocity, "anti-ship", interception_max_probabolities, laser_interception_timing_data, scenario)
 
 class Drone(Target):
-    def __init__(self, distance=None, velocity=None):
+    def __init__(self, distance=None, velocity=None, scenario=DEFAULT_SCENARIO):
         interception_max_probabolities = {"dome": 0.8, "beam" : 0.9, "LRAD": 0}
         laser_interception_timing_data = {3 : 4, 6 : 6, 14 : 9} # distance [km] : time [s]
         if distance is None:
             distance = np.random.normal(10, 2)
         if velocity is None:
             velocity = np.random.normal(180, 5)
-        super().__init__(distance, velocity, "drone", interception_max_probabolities, laser_interception_timing_data)
+        super().__init__(distance, velocity, "drone", interception_max_probabolities, laser_interception_timing_data, scenario)
 
 class Ballistic_Missile(Target):
-    def __init__(self, distance=None, velocity=None):
+    def __init__(self, distance=None, velocity=None, scenario=DEFAULT_SCENARIO):
         interception_max_probabolities = {"dome": 0.9, "beam" : 0, "LRAD": 0}
         laser_interception_timing_data = None
         if distance is None:
             distance = np.random.normal(20, 3) # to be checked with Shaked
         if velocity is None:
             velocity = np.random.normal(3000, 100) # to be checked with Shaked
-        super().__init__(distance, velocity, "balistic", interception_max_probabolities, laser_interception_timing_data)
+        super().__init__(distance, velocity, "balistic", interception_max_probabolities, laser_interception_timing_data, scenario)
         
\ No newline at end of file
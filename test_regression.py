@@ -0,0 +1,170 @@
+import json
+import math
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pytest
+from scenario import Scenario
+from simulation import Simulation
+from regression import (REFERENCE, OPTIMIZED, SHIP_HIT, run_engine, ks_test, check_format, check_data_layout,
+                        check_ship_hit_convention, check_files_format, check_deterministic, compare_engines,
+                        check_baseline)
+
+# The default run replays a few seeds per check; the distributional checks over the study range
+# (10-100 targets) are marked slow and run with --runslow.
+NUM_TARGETS = 10
+SEEDS = range(30)
+REPLAY_SEEDS = range(3)
+TUNNELLING = Scenario(time_step=0.2)  # per-frame engine on a step too coarse for its collision check
+TASK_GROUP_ENGINES = [Scenario(time_step=0.05), Scenario(time_step=0.05, analytic_intercepts=True)]
+TASK_GROUPS = {
+    'pair': [(200, 300), (600, 300)],
+    'square': [(325, 300), (475, 300), (400, 150), (400, 450)],
+}
+
+
+@pytest.mark.parametrize('scenario', [REFERENCE, OPTIMIZED], ids=['reference', 'optimized'])
+@pytest.mark.parametrize('group', [None, 'pair'], ids=['single_unit', 'task_group'])
+def test_engine_is_deterministic(scenario, group):
+    assert check_deterministic(scenario, NUM_TARGETS, REPLAY_SEEDS, TASK_GROUPS.get(group)) == []
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('num_targets', [10, 60, 100])
+def test_optimized_matches_reference(num_targets):
+    assert compare_engines(REFERENCE, OPTIMIZED, num_targets, SEEDS) == []
+
+
+@pytest.mark.slow
+def test_optimized_matches_reference_for_task_group():
+    assert compare_engines(REFERENCE, OPTIMIZED, 60, SEEDS, unit_positions=TASK_GROUPS['pair']) == []
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('num_targets', [20, 60, 100])
+def test_reference_stays_close_to_original_engine(num_targets):
+    assert check_baseline(REFERENCE, num_targets) == []
+
+
+def test_baseline_check_detects_drift(tmp_path):
+    pinned = tmp_path / "data_pinned"
+    runs = [run_engine(REFERENCE, NUM_TARGETS, with_laser, REPLAY_SEEDS) for with_laser in (True, False)]
+    pinned.write_text(json.dumps({str(NUM_TARGETS): [[int(w), int(wo)] for w, wo in zip(*runs)]}))
+    assert check_baseline(REFERENCE, NUM_TARGETS, pinned) == []
+    assert check_baseline(TUNNELLING, NUM_TARGETS, pinned) != []
+
+
+def test_exact_comparison_accepts_identical_engines():
+    assert compare_engines(REFERENCE, REFERENCE, NUM_TARGETS, REPLAY_SEEDS, exact=True) == []
+
+
+def test_exact_comparison_reports_differing_runs():
+    errors = compare_engines(REFERENCE, TUNNELLING, NUM_TARGETS, REPLAY_SEEDS, exact=True)
+    assert any("differ" in error for error in errors)
+
+
+@pytest.mark.slow
+def test_statistical_comparison_detects_drift():
+    errors = compare_engines(REFERENCE, TUNNELLING, NUM_TARGETS, range(15))
+    assert any("ship-hit rate" in error for error in errors)
+
+
+@pytest.mark.parametrize('scenario', [REFERENCE, OPTIMIZED, TUNNELLING], ids=['reference', 'optimized', 'tunnelling'])
+@pytest.mark.parametrize('with_laser', [True, False], ids=['with_laser', 'without_laser'])
+def test_ship_hit_returns_minus_one(scenario, with_laser):
+    assert check_ship_hit_convention(scenario, NUM_TARGETS, with_laser, REPLAY_SEEDS) == []
+
+
+def test_tunnelling_engine_exercises_ship_hits():
+    # keeps the convention test above honest: these seeds end both with and without a ship hit
+    runs = run_engine(TUNNELLING, NUM_TARGETS, True, REPLAY_SEEDS)
+    assert (runs == SHIP_HIT).any() and (runs != SHIP_HIT).any(), runs
+
+
+def test_check_format():
+    assert check_format(np.array([0, 3, SHIP_HIT])) == []
+    assert check_format(np.array([1, -2])) != []
+    assert check_format(np.array([1.5, 2.0])) != []
+    assert check_format(np.array([999])) != []
+
+
+def test_check_data_layout():
+    assert check_data_layout({"10": [[3, 12], [SHIP_HIT, 14]]}) == []
+    assert check_data_layout({"ten": [[3, 12]]}) != []
+    assert check_data_layout({"10": [[3, 12, 1]]}) != []
+    assert check_data_layout({"10": [[3.5, 12]]}) != []
+    assert check_data_layout({"10": [[-2, 12]]}) != []
+
+
+@pytest.mark.parametrize('scenario', [OPTIMIZED, TUNNELLING], ids=['optimized', 'tunnelling'])
+def test_data_and_result_files(scenario, tmp_path):
+    with_laser = run_engine(scenario, NUM_TARGETS, True, REPLAY_SEEDS)
+    without_laser = run_engine(scenario, NUM_TARGETS, False, REPLAY_SEEDS)
+    assert check_files_format(NUM_TARGETS, with_laser, without_laser, tmp_path) == []
+
+
+def test_ks_test():
+    same = np.arange(50)
+    assert ks_test(same, same) == (0.0, 1.0)
+    statistic, p_value = ks_test(np.arange(50), np.arange(50) + 40)
+    assert statistic == pytest.approx(0.8) and p_value < 1e-6
+
+
+@pytest.mark.parametrize('scenario', TASK_GROUP_ENGINES, ids=['per_frame', 'analytic'])
+@pytest.mark.parametrize('group', TASK_GROUPS)
+@pytest.mark.parametrize('with_laser', [True, False], ids=['with_laser', 'without_laser'])
+def test_close_task_group_is_not_always_hit(scenario, group, with_laser):
+    runs = run_engine(scenario, 20, with_laser, range(5), unit_positions=TASK_GROUPS[group])
+    # a single ship survives nearly every run of this size, the task group must not do worse
+    assert (runs == SHIP_HIT).mean() < 0.5, runs
+
+
+class EngagementCheckingSimulation(Simulation):
+    """Records, after every frame, each target engaged or allocated by more than one unit."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.violations = []
+
+    def drawing_screen(self, dt):
+        for target_symbol in self.target_symbols:
+            engaging = [unit for unit in self.units if unit.is_engaging(target_symbol) or
+                        any(interceptor.get_target_symbol() is target_symbol for interceptor in unit.interceptors)]
+            allocated = [unit for unit in self.units if target_symbol in unit.target_symbols]
+            if len(engaging) > 1 or len(allocated) != 1:
+                self.violations.append((self.clock_time, len(engaging), len(allocated)))
+        super().drawing_screen(dt)
+
+
+@pytest.mark.parametrize('scenario', TASK_GROUP_ENGINES, ids=['per_frame', 'analytic'])
+@pytest.mark.parametrize('with_laser', [True, False], ids=['with_laser', 'without_laser'])
+def test_no_target_is_engaged_by_two_units(scenario, with_laser):
+    for seed in range(3):
+        random.seed(seed)
+        np.random.seed(seed)
+        simulation = EngagementCheckingSimulation(scenario, TASK_GROUPS['square'])
+        simulation.run(30, with_laser=with_laser)
+        assert simulation.violations == [], f"seed {seed}: (time, engaging units, allocated units)"
+
+
+@pytest.mark.parametrize('cell_size', [1, 30, 100])
+def test_spatial_grid_nearest_matches_brute_force(cell_size):
+    rng = random.Random(cell_size)
+    for _ in range(200):
+        points = [(rng.uniform(-200, 1000), rng.uniform(-200, 800)) for _ in range(rng.randint(1, 30))]
+        grid = Simulation.SpatialGrid(cell_size)
+        for i, (x, y) in enumerate(points):
+            grid.insert(i, x, y)
+        x, y = rng.uniform(-600, 1400), rng.uniform(-600, 1200)  # queries may fall outside the occupied cells
+        for accept in (None, lambda i: i % 3 == 1):
+            candidates = [i for i in range(len(points)) if accept is None or accept(i)]
+            nearest = grid.nearest(x, y, points.__getitem__, accept)
+            if not candidates:
+                assert nearest is None
+                continue
+            expected = min(math.hypot(points[i][0] - x, points[i][1] - y) for i in candidates)
+            assert nearest in candidates
+            assert math.hypot(points[nearest][0] - x, points[nearest][1] - y) == expected